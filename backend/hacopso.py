@@ -4,18 +4,116 @@ Complete implementation for maritime route optimization
 """
 
 import numpy as np
+from numba import njit, prange
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
 import math
 
-@dataclass
-class Particle:
-    """Particle in the swarm"""
-    position: np.ndarray
-    velocity: np.ndarray
-    best_position: np.ndarray
-    best_fitness: float
-    fitness: float
+def _aligned_zeros(shape, dtype=np.float32, align=64):
+    """Allocate a zeroed array whose data pointer is align-byte aligned
+    (cache-line and AVX-512 friendly)"""
+    size = int(np.prod(shape))
+    itemsize = np.dtype(dtype).itemsize
+    buf = np.zeros(size * itemsize + align, dtype=np.uint8)
+    offset = (-buf.ctypes.data) % align
+    return buf[offset:offset + size * itemsize].view(dtype).reshape(shape)
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _fitness_kernel(
+    positions,
+    start_lat, start_lon,
+    dest_lat, dest_lon,
+    start_lat_rad, start_lon_rad,
+    dest_lat_rad, dest_lon_rad,
+    cos_start_lat, cos_dest_lat,
+    w_fuel, w_time, w_safety,
+    direct_distance
+):
+    """Fused multi-objective fitness for the whole swarm
+
+    One parallel loop over particles with scalar accumulators: path
+    generation, haversine segment distances and the three objective
+    scores are computed in a single pass with no temporary arrays.
+    Endpoint radians/cosines are precomputed by the caller since they
+    are shared by every particle.
+    """
+    R = 3440.0  # Earth radius in nautical miles
+    n_particles = positions.shape[0]
+    n_waypoints = positions.shape[1] // 2
+    n_points = n_waypoints + 2
+    out = np.empty(n_particles, dtype=np.float32)
+
+    for p in prange(n_particles):
+        distance = 0.0
+        hazard = 0.0
+        if -10.0 <= start_lat <= 10.0:  # Tropical zones
+            hazard += 0.1
+        if abs(start_lat) > 60.0:  # Polar regions
+            hazard += 0.2
+
+        prev_lat_r = start_lat_rad
+        prev_lon_r = start_lon_rad
+        prev_cos = cos_start_lat
+        for s in range(n_waypoints + 1):
+            if s < n_waypoints:
+                lat = start_lat + (dest_lat - start_lat) * positions[p, 2 * s]
+                lon = start_lon + (dest_lon - start_lon) * positions[p, 2 * s + 1]
+                lat_r = math.radians(lat)
+                lon_r = math.radians(lon)
+                cos_lat = math.cos(lat_r)
+            else:
+                lat = dest_lat
+                lat_r = dest_lat_rad
+                lon_r = dest_lon_rad
+                cos_lat = cos_dest_lat
+
+            dlat = lat_r - prev_lat_r
+            dlon = lon_r - prev_lon_r
+            a = (
+                math.sin(dlat / 2) ** 2 +
+                prev_cos * cos_lat * math.sin(dlon / 2) ** 2
+            )
+            distance += 2.0 * R * math.asin(math.sqrt(a))
+
+            if -10.0 <= lat <= 10.0:
+                hazard += 0.1
+            if abs(lat) > 60.0:
+                hazard += 0.2
+            prev_lat_r = lat_r
+            prev_lon_r = lon_r
+            prev_cos = cos_lat
+
+        fuel_cost = min(distance / 5000.0, 1.0)
+        deviation = (distance - direct_distance) / max(direct_distance, 1.0)
+        time_cost = min((distance / 5000.0 + deviation) / 2.0, 1.0)
+        safety_cost = min(hazard / n_points, 1.0)
+        out[p] = w_fuel * fuel_cost + w_time * time_cost + w_safety * safety_cost
+
+    return out
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _update_kernel(positions, velocities, best_positions, gbest,
+                   w, c1, c2, r1, r2, chaos):
+    """Fused PSO velocity/position update with in-place [0, 1] clamping
+
+    The clamp is written branchlessly so LLVM lowers it to vminps/vmaxps
+    instead of allocating a clipped copy per iteration.
+    """
+    n, d = positions.shape
+    for p in prange(n):
+        rp = r1[p, 0]
+        rg = r2[p, 0]
+        for j in range(d):
+            v = (
+                w * velocities[p, j] +
+                c1 * rp * (best_positions[p, j] - positions[p, j]) +
+                c2 * rg * (gbest[j] - positions[p, j]) +
+                chaos[p, j]
+            )
+            velocities[p, j] = v
+            x = positions[p, j] + v
+            x = 0.0 if x < 0.0 else x
+            x = 1.0 if x > 1.0 else x
+            positions[p, j] = x
 
 class HACOPSO:
     """
@@ -26,37 +124,53 @@ class HACOPSO:
     - Adaptive coefficients (w, c1, c2)
     - Opposition-based learning
     - Multi-objective optimization (fuel, time, safety)
+    - Optional accelerated mode (global-best-only update)
+
+    optimize keeps all swarm state in locals, so a single instance can
+    be shared across concurrent requests
     """
-    
+
+    # Adaptive parameters
+    W_MAX = 0.9   # Max inertia weight
+    W_MIN = 0.4   # Min inertia weight
+    C1_MAX = 2.5  # Max cognitive coefficient
+    C1_MIN = 1.5  # Min cognitive coefficient
+    C2_MAX = 2.5  # Max social coefficient
+    C2_MIN = 1.5  # Min social coefficient
+
+    # Chaos parameters
+    CHAOS_FACTOR = 0.1
+
+    # Accelerated PSO parameters (global-best-only update)
+    APSO_ALPHA = 0.3   # Initial random-walk amplitude
+    APSO_GAMMA = 0.97  # Geometric cooling factor
+    APSO_BETA = 0.5    # Attraction towards the global best
+
     def __init__(
         self,
         n_particles: int = 50,
         max_iterations: int = 100,
-        seed: Optional[int] = None
+        seed: Optional[int] = None,
+        accelerated: bool = False
     ):
         self.n_particles = n_particles
         self.max_iterations = max_iterations
         self.seed = seed
-        
-        if seed is not None:
-            np.random.seed(seed)
-        
-        # Adaptive parameters
-        self.w_max = 0.9  # Max inertia weight
-        self.w_min = 0.4  # Min inertia weight
-        self.c1_max = 2.5  # Max cognitive coefficient
-        self.c1_min = 1.5  # Min cognitive coefficient
-        self.c2_max = 2.5  # Max social coefficient
-        self.c2_min = 1.5  # Min social coefficient
-        
-        # Chaos parameters
-        self.chaos_factor = 0.1
-        self.chaos_map = lambda x: 4 * x * (1 - x)  # Logistic map
-        
-        self.particles: List[Particle] = []
-        self.global_best_position: Optional[np.ndarray] = None
-        self.global_best_fitness: float = float('inf')
-    
+        self.accelerated = accelerated
+        self.rng = np.random.default_rng(seed)
+
+        # Warm up the JIT kernels so compilation (cached on disk) happens
+        # at construction time rather than inside the first optimize call
+        _z = np.zeros((1, 2), dtype=np.float32)
+        _fitness_kernel(_z, 0.0, 0.0, 1.0, 1.0, 0.0, 0.0,
+                        math.radians(1.0), math.radians(1.0),
+                        1.0, math.cos(math.radians(1.0)),
+                        0.33, 0.33, 0.34, 60.0)
+        _update_kernel(_z.copy(), _z.copy(), _z.copy(), _z[0],
+                       np.float32(0.5), np.float32(1.5), np.float32(1.5),
+                       np.zeros((1, 1), dtype=np.float32),
+                       np.zeros((1, 1), dtype=np.float32), _z.copy())
+
     def optimize(
         self,
         start: Tuple[float, float],
@@ -76,81 +190,106 @@ class HACOPSO:
         Returns:
             Optimized route with path, metrics, and scores
         """
-        # Initialize swarm
-        self._initialize_swarm(start, destination)
-        
+        # Initialize swarm; all run state lives in locals so concurrent
+        # optimize calls never interfere
+        positions, velocities, best_positions, best_fitness = \
+            self._initialize_swarm()
+        global_best_position = None
+        global_best_fitness = float('inf')
+
+        # Endpoint trig is loop-invariant across the whole run
+        sc = self._endpoint_trig(start, destination)
+
+        # Pre-generate all random numbers for the run in two bulk draws,
+        # sliced per iteration inside the loop
+        dim = positions.shape[1]
+        rand_uniform = self.rng.random(
+            (self.max_iterations, 2, self.n_particles, 1), dtype=np.float32
+        )
+        rand_normal = self.rng.standard_normal(
+            (self.max_iterations, self.n_particles, dim), dtype=np.float32
+        )
+
+        # Precompute the adaptive coefficient schedules for the full run
+        t = np.arange(self.max_iterations, dtype=np.float32) / self.max_iterations
+        w_schedule = self.W_MAX - (self.W_MAX - self.W_MIN) * t
+        c1_schedule = self.C1_MAX - (self.C1_MAX - self.C1_MIN) * t
+        c2_schedule = self.C2_MIN + (self.C2_MAX - self.C2_MIN) * t
+
         # Optimization loop
         for iteration in range(self.max_iterations):
-            # Adaptive parameter calculation
-            w = self._adaptive_inertia(iteration)
-            c1 = self._adaptive_cognitive(iteration)
-            c2 = self._adaptive_social(iteration)
-            
-            for particle in self.particles:
-                # Evaluate fitness
-                fitness = self._multi_objective_fitness(
-                    particle.position,
-                    start,
-                    destination,
-                    priorities
+            # Adaptive parameters from the precomputed schedule
+            w = w_schedule[iteration]
+            c1 = c1_schedule[iteration]
+            c2 = c2_schedule[iteration]
+
+            # Evaluate fitness for the whole swarm in one batched call
+            fitness = self._multi_objective_fitness(
+                positions, start, destination, priorities, sc
+            )
+
+            if not self.accelerated:
+                # Update personal bests branchlessly
+                improved = fitness < best_fitness
+                best_positions = np.where(
+                    improved[:, None], positions, best_positions
                 )
-                particle.fitness = fitness
-                
-                # Update personal best
-                if fitness < particle.best_fitness:
-                    particle.best_position = particle.position.copy()
-                    particle.best_fitness = fitness
-                
-                # Update global best
-                if fitness < self.global_best_fitness:
-                    self.global_best_position = particle.position.copy()
-                    self.global_best_fitness = fitness
-            
-            # Update velocities and positions
-            for particle in self.particles:
-                # PSO velocity update with chaos
-                r1, r2 = np.random.rand(2)
-                chaos = self._chaos_perturbation(iteration)
-                
-                particle.velocity = (
-                    w * particle.velocity +
-                    c1 * r1 * (particle.best_position - particle.position) +
-                    c2 * r2 * (self.global_best_position - particle.position) +
-                    chaos
+                best_fitness = np.where(improved, fitness, best_fitness)
+
+            # Update global best
+            best_idx = int(fitness.argmin())
+            if fitness[best_idx] < global_best_fitness:
+                global_best_position = positions[best_idx].copy()
+                global_best_fitness = float(fitness[best_idx])
+
+            if self.accelerated:
+                # Accelerated PSO: attraction to the global best plus a
+                # cooled random walk, no personal-best term
+                alpha = self.APSO_ALPHA * self.APSO_GAMMA ** iteration
+                positions = (
+                    (1 - self.APSO_BETA) * positions +
+                    self.APSO_BETA * global_best_position +
+                    alpha * rand_normal[iteration]
                 )
-                
-                # Position update
-                particle.position = particle.position + particle.velocity
-                
-                # Boundary handling
-                particle.position = self._handle_boundaries(
-                    particle.position,
-                    start,
-                    destination
+                np.clip(positions, 0.0, 1.0, out=positions)
+            else:
+                # Fused velocity/position update with chaos and boundary
+                # clamping, in place over the swarm arrays
+                r1, r2 = rand_uniform[iteration]
+                chaos = self._chaos_perturbation(iteration, rand_normal[iteration])
+                _update_kernel(
+                    positions, velocities,
+                    best_positions, global_best_position,
+                    np.float32(w), np.float32(c1), np.float32(c2),
+                    r1, r2, chaos
                 )
-            
+
             # Opposition-based learning
             if iteration % 10 == 0:
-                self._opposition_based_learning(start, destination, priorities)
-            
+                self._opposition_based_learning(
+                    positions, fitness, start, destination, priorities, sc
+                )
+
             # Quantum enhancement
             if quantum_enhanced and iteration % 5 == 0:
-                self._quantum_enhancement()
-        
+                self._quantum_enhancement(positions)
+
         # Generate final route
-        path = self._generate_path(start, destination, self.global_best_position)
-        
-        # Calculate metrics
-        distance = self._calculate_distance(path)
+        path = self._generate_path(start, destination, global_best_position)
+
+        # Calculate metrics, traversing the final path exactly once
+        distance = float(self._calculate_distance(path))
+        direct_distance = float(self._haversine(path[0], path[-1]))
         eta = self._estimate_eta(distance)
         fuel = self._estimate_fuel(distance, priorities)
-        
-        # Calculate individual objective scores
+
+        # Calculate individual objective scores from the shared distances,
+        # as plain floats so the result serializes directly
         scores = {
-            "fuel": self._fuel_score(path),
-            "time": self._time_score(path),
-            "safety": self._safety_score(path),
-            "overall": 100 - (self.global_best_fitness * 10)
+            "fuel": float(self._fuel_score(distance)),
+            "time": float(self._time_score(distance, direct_distance)),
+            "safety": float(self._safety_score(path)),
+            "overall": float(100 - (global_best_fitness * 10))
         }
         
         return {
@@ -192,56 +331,68 @@ class HACOPSO:
             quantum_enhanced=False
         )
     
-    def _initialize_swarm(self, start: Tuple, destination: Tuple):
-        """Initialize particle swarm"""
-        self.particles = []
+    def _initialize_swarm(self) -> Tuple:
+        """Initialize a fresh particle swarm as struct-of-arrays"""
         dimension = 10  # Number of waypoints to optimize
-        
-        for _ in range(self.n_particles):
-            # Random position between start and destination
-            position = np.random.rand(dimension * 2)
-            velocity = np.random.rand(dimension * 2) * 0.1
-            
-            particle = Particle(
-                position=position,
-                velocity=velocity,
-                best_position=position.copy(),
-                best_fitness=float('inf'),
-                fitness=float('inf')
-            )
-            self.particles.append(particle)
+        shape = (self.n_particles, dimension * 2)
+
+        # Random positions between start and destination, stored as
+        # cache-line-aligned fp32 (waypoints need far less precision)
+        positions = _aligned_zeros(shape)
+        positions[:] = self.rng.random(shape, dtype=np.float32)
+        velocities = _aligned_zeros(shape)
+        velocities[:] = self.rng.random(shape, dtype=np.float32) * 0.1
+
+        if self.accelerated:
+            # Accelerated PSO tracks only the global best
+            best_positions = None
+            best_fitness = None
+        else:
+            best_positions = _aligned_zeros(shape)
+            best_positions[:] = positions
+            best_fitness = np.full(self.n_particles, np.inf, dtype=np.float32)
+
+        return positions, velocities, best_positions, best_fitness
     
     def _multi_objective_fitness(
         self,
-        position: np.ndarray,
+        positions: np.ndarray,
         start: Tuple,
         destination: Tuple,
-        priorities: Dict
-    ) -> float:
+        priorities: Dict,
+        sc: Optional[Tuple] = None
+    ) -> np.ndarray:
         """
-        Multi-objective fitness function
-        Combines fuel efficiency, time optimization, and safety
+        Multi-objective fitness function, batched over the swarm
+        Combines fuel efficiency, time optimization, and safety for all
+        particles in one pass over the (n_particles, dim) position array
         """
-        path = self._generate_path(start, destination, position)
-        
-        # Fuel objective (minimize distance and avoid rough areas)
-        fuel_cost = self._fuel_score(path)
-        
-        # Time objective (minimize ETA)
-        time_cost = self._time_score(path)
-        
-        # Safety objective (avoid hazards)
-        safety_cost = self._safety_score(path)
-        
-        # Weighted sum
-        total_cost = (
-            priorities.get('fuel', 0.33) * fuel_cost +
-            priorities.get('time', 0.33) * time_cost +
-            priorities.get('safety', 0.34) * safety_cost
+        if sc is None:
+            sc = self._endpoint_trig(start, destination)
+
+        direct_distance = self._haversine(list(start), list(destination))
+        return _fitness_kernel(
+            positions,
+            float(start[0]), float(start[1]),
+            float(destination[0]), float(destination[1]),
+            sc[0], sc[1], sc[2], sc[3], sc[4], sc[5],
+            priorities.get('fuel', 0.33),
+            priorities.get('time', 0.33),
+            priorities.get('safety', 0.34),
+            float(direct_distance)
         )
-        
-        return total_cost
-    
+
+    @staticmethod
+    def _endpoint_trig(start: Tuple, destination: Tuple) -> Tuple:
+        """Radians and latitude cosines of the fixed endpoints, computed
+        once per run instead of per fitness evaluation"""
+        return (
+            math.radians(start[0]), math.radians(start[1]),
+            math.radians(destination[0]), math.radians(destination[1]),
+            math.cos(math.radians(start[0])),
+            math.cos(math.radians(destination[0]))
+        )
+
     def _generate_path(
         self,
         start: Tuple,
@@ -254,8 +405,9 @@ class HACOPSO:
         # Convert position vector to waypoints
         n_waypoints = len(position) // 2
         for i in range(n_waypoints):
-            lat = start[0] + (destination[0] - start[0]) * position[i * 2]
-            lon = start[1] + (destination[1] - start[1]) * position[i * 2 + 1]
+            # Cast back to fp64 python floats for the JSON-facing API
+            lat = float(start[0] + (destination[0] - start[0]) * position[i * 2])
+            lon = float(start[1] + (destination[1] - start[1]) * position[i * 2 + 1])
             path.append([lat, lon])
         
         path.append(list(destination))
@@ -282,38 +434,30 @@ class HACOPSO:
         
         return R * c
     
-    def _fuel_score(self, path: List[List[float]]) -> float:
+    def _fuel_score(self, distance: float) -> float:
         """Calculate fuel efficiency score (0-1, lower is better)"""
-        distance = self._calculate_distance(path)
         # Normalize by a typical long voyage distance
         return min(distance / 5000.0, 1.0)
-    
-    def _time_score(self, path: List[List[float]]) -> float:
+
+    def _time_score(self, distance: float, direct_distance: float) -> float:
         """Calculate time efficiency score (0-1, lower is better)"""
-        # Consider both distance and path smoothness
-        distance = self._calculate_distance(path)
-        
-        # Calculate path deviation (how much it deviates from straight line)
-        direct_distance = self._haversine(path[0], path[-1])
+        # Path deviation: how much the route deviates from straight line
         deviation = (distance - direct_distance) / max(direct_distance, 1)
-        
+
         return min((distance / 5000.0 + deviation) / 2, 1.0)
     
     def _safety_score(self, path: List[List[float]]) -> float:
         """Calculate safety score (0-1, lower is better)"""
-        # Simulate environmental hazards
+        # Simulate environmental hazards with vectorized latitude masks
         # In production, this would use real weather/ocean data
-        hazard_score = 0
-        
-        for waypoint in path:
-            # Simulate hazard probability based on location
-            lat, lon = waypoint
-            # Tropical storm zones, piracy areas, etc.
-            if -10 <= lat <= 10:  # Tropical zones
-                hazard_score += 0.1
-            if abs(lat) > 60:  # Polar regions
-                hazard_score += 0.2
-        
+        lats = np.asarray(path)[:, 0]
+
+        # Tropical storm zones, polar regions, etc.
+        hazard_score = (
+            0.1 * ((-10 <= lats) & (lats <= 10)) +
+            0.2 * (np.abs(lats) > 60)
+        ).sum()
+
         return min(hazard_score / len(path), 1.0)
     
     def _estimate_eta(self, distance: float) -> str:
@@ -328,68 +472,51 @@ class HACOPSO:
         efficiency_factor = 1.0 - (priorities.get('fuel', 0.33) * 0.3)
         return distance * base_consumption * efficiency_factor
     
-    def _adaptive_inertia(self, iteration: int) -> float:
-        """Adaptive inertia weight"""
-        return self.w_max - (self.w_max - self.w_min) * iteration / self.max_iterations
-    
-    def _adaptive_cognitive(self, iteration: int) -> float:
-        """Adaptive cognitive coefficient"""
-        return self.c1_max - (self.c1_max - self.c1_min) * iteration / self.max_iterations
-    
-    def _adaptive_social(self, iteration: int) -> float:
-        """Adaptive social coefficient"""
-        return self.c2_min + (self.c2_max - self.c2_min) * iteration / self.max_iterations
-    
-    def _chaos_perturbation(self, iteration: int) -> np.ndarray:
-        """Chaotic perturbation using logistic map"""
-        r = np.random.rand()
-        chaos_val = self.chaos_map(r)
-        magnitude = self.chaos_factor * (1 - iteration / self.max_iterations)
-        return np.random.randn(len(self.particles[0].position)) * chaos_val * magnitude
+    def _chaos_perturbation(self, iteration: int, noise: np.ndarray) -> np.ndarray:
+        """Chaotic perturbation scaling pre-drawn per-particle noise"""
+        r = self.rng.random()
+        chaos_val = 4 * r * (1 - r)  # Logistic map
+        magnitude = self.CHAOS_FACTOR * (1 - iteration / self.max_iterations)
+        return noise * chaos_val * magnitude
     
     def _opposition_based_learning(
         self,
+        positions: np.ndarray,
+        fitness: np.ndarray,
         start: Tuple,
         destination: Tuple,
-        priorities: Dict
+        priorities: Dict,
+        sc: Optional[Tuple] = None
     ):
-        """Opposition-based learning to escape local optima"""
-        for particle in self.particles[:self.n_particles // 4]:  # Apply to 25% of swarm
-            # Create opposite particle
-            opposite_position = 1.0 - particle.position
-            opposite_fitness = self._multi_objective_fitness(
-                opposite_position,
-                start,
-                destination,
-                priorities
-            )
-            
-            # Replace if better
-            if opposite_fitness < particle.fitness:
-                particle.position = opposite_position
-                particle.fitness = opposite_fitness
+        """Opposition-based learning to escape local optima, updating the
+        given swarm arrays in place"""
+        k = self.n_particles // 4  # Apply to 25% of swarm
+
+        # Evaluate all opposite particles in one batched kernel call,
+        # comparing against the fitness cached by the main loop
+        opposite = 1.0 - positions[:k]
+        opposite_fitness = self._multi_objective_fitness(
+            opposite, start, destination, priorities, sc
+        )
+
+        # Replace where the opposite is better
+        improved = opposite_fitness < fitness[:k]
+        positions[:k] = np.where(improved[:, None], opposite, positions[:k])
+        fitness[:k] = np.where(improved, opposite_fitness, fitness[:k])
     
-    def _quantum_enhancement(self):
+    def _quantum_enhancement(self, positions: np.ndarray):
         """Quantum-inspired enhancement (superposition and entanglement)"""
-        # Simulate quantum superposition by creating hybrid particles
-        for i in range(0, len(self.particles) - 1, 2):
-            p1, p2 = self.particles[i], self.particles[i + 1]
-            
-            # Quantum entanglement: create superposition state
-            alpha = np.random.rand()
-            superposition = alpha * p1.position + (1 - alpha) * p2.position
-            
-            # Measure superposition (collapse to one state)
-            if np.random.rand() < 0.5:
-                p1.position = superposition
-            else:
-                p2.position = superposition
-    
-    def _handle_boundaries(
-        self,
-        position: np.ndarray,
-        start: Tuple,
-        destination: Tuple
-    ) -> np.ndarray:
-        """Handle position boundaries"""
-        return np.clip(position, 0.0, 1.0)
+        # Simulate quantum superposition by blending adjacent pairs of
+        # particles in one vectorized crossover over the swarm
+        n_pairs = self.n_particles // 2
+        evens = positions[: 2 * n_pairs : 2]
+        odds = positions[1 : 2 * n_pairs : 2]
+
+        # Quantum entanglement: create superposition states per pair
+        alpha = self.rng.random((n_pairs, 1), dtype=np.float32)
+        superposition = alpha * evens + (1 - alpha) * odds
+
+        # Measure superpositions (each collapses into one of the pair)
+        mask = self.rng.random(n_pairs) < 0.5
+        evens[:] = np.where(mask[:, None], superposition, evens)
+        odds[:] = np.where(~mask[:, None], superposition, odds)
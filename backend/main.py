@@ -3,26 +3,30 @@ BluePath - Maritime Route Optimization System
 FastAPI Backend with HACOPSO Algorithm
 """
 
-from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks
+from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional, Dict
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 import asyncio
-import json
+import orjson
 from datetime import datetime
 import hashlib
 import hmac
 import os
 
 from hacopso import HACOPSO
-from database import get_db, Route, Telemetry, AuditLog
+from database import get_db, SessionLocal, Route, Telemetry, AuditLog
 from telemetry_simulator import TelemetrySimulator
 
 app = FastAPI(
     title="BluePath API",
     description="Maritime Route Optimization with HACOPSO Algorithm",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware - Updated for production deployment
@@ -41,8 +45,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Audit-chain signing secret, encoded once at import; hmac.digest skips
+# the HMAC object machinery and goes straight to OpenSSL's SHA-256
+_AUDIT_SECRET = os.getenv("AUDIT_SECRET", "default-secret-key").encode()
+
 # Global state
 active_websockets: Dict[str, List[WebSocket]] = {}
+
+# Telemetry ingest buffer: rows are batched and flushed with one
+# bulk insert instead of paying a commit per sample
+TELEMETRY_FLUSH_SIZE = 64
+TELEMETRY_FLUSH_INTERVAL = 2.0  # seconds
+telemetry_buffer: List[Dict] = []
+telemetry_buffer_lock = asyncio.Lock()
+
+# LRU cache of optimization results keyed on quantized request inputs,
+# so identical demo requests skip the full PSO run
+ROUTE_CACHE_SIZE = 256
+route_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+
+# Safe to share: optimize keeps all swarm state in locals, so concurrent
+# calls (and pool workers, each with their own module copy) don't interact
 hacopso_optimizer = HACOPSO(
     n_particles=50,
     max_iterations=100,
@@ -84,33 +107,44 @@ class AuditEntry(BaseModel):
 # API Endpoints
 
 @app.post("/api/route/compute", response_model=RouteResponse)
-async def compute_route(request: RouteRequest, background_tasks: BackgroundTasks):
+async def compute_route(
+    request: RouteRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """
     Compute optimal maritime route using HACOPSO algorithm
     """
     try:
-        # Initialize optimizer with request parameters
-        result = hacopso_optimizer.optimize(
-            start=(request.start_lat, request.start_lon),
-            destination=(request.dest_lat, request.dest_lon),
-            priorities=request.priorities,
-            quantum_enhanced=request.quantum_mode
-        )
-        
+        # Reuse a cached result for identical inputs, otherwise run the
+        # optimizer and remember the outcome
+        cache_key = _route_cache_key(request)
+        result = route_cache.get(cache_key)
+        if result is not None:
+            route_cache.move_to_end(cache_key)
+        else:
+            # CPU-bound: run in a worker process so the event loop stays
+            # free for telemetry pushes and websocket traffic
+            result = await asyncio.get_running_loop().run_in_executor(
+                app.state.pool, _run_optimize, request.dict()
+            )
+            route_cache[cache_key] = result
+            if len(route_cache) > ROUTE_CACHE_SIZE:
+                route_cache.popitem(last=False)
+
         # Generate route ID
         route_id = hashlib.sha256(
             f"{request.start_lat}{request.start_lon}{datetime.utcnow().isoformat()}".encode()
         ).hexdigest()[:16]
         
         # Store in database
-        db = next(get_db())
         db_route = Route(
             route_id=route_id,
-            path=json.dumps(result['path']),
+            path=orjson.dumps(result['path']).decode(),
             distance=result['distance'],
             eta=result['eta'],
             fuel_estimate=result['fuel'],
-            scores=json.dumps(result['scores'])
+            scores=orjson.dumps(result['scores']).decode()
         )
         db.add(db_route)
         db.commit()
@@ -134,11 +168,10 @@ async def compute_route(request: RouteRequest, background_tasks: BackgroundTasks
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/route/{route_id}")
-async def get_route(route_id: str):
+async def get_route(route_id: str, db: Session = Depends(get_db)):
     """
     Retrieve route information by ID
     """
-    db = next(get_db())
     route = db.query(Route).filter(Route.route_id == route_id).first()
     
     if not route:
@@ -146,11 +179,11 @@ async def get_route(route_id: str):
     
     return {
         "route_id": route.route_id,
-        "path": json.loads(route.path),
+        "path": orjson.loads(route.path),
         "distance": route.distance,
         "eta": route.eta,
         "fuel_estimate": route.fuel_estimate,
-        "scores": json.loads(route.scores)
+        "scores": orjson.loads(route.scores)
     }
 
 @app.post("/api/iot/push")
@@ -158,21 +191,14 @@ async def push_telemetry(data: TelemetryData):
     """
     Receive IoT telemetry data and trigger re-optimization if needed
     """
-    db = next(get_db())
-    
-    # Store telemetry
-    telemetry = Telemetry(
-        route_id=data.route_id,
-        timestamp=data.timestamp,
-        wave_height=data.wave_height,
-        wind_speed=data.wind_speed,
-        current_speed=data.current_speed,
-        visibility=data.visibility,
-        temperature=data.temperature
-    )
-    db.add(telemetry)
-    db.commit()
-    
+    # Buffer the sample; a bulk insert happens when the buffer fills or
+    # on the periodic flush task
+    async with telemetry_buffer_lock:
+        telemetry_buffer.append(data.dict())
+        should_flush = len(telemetry_buffer) >= TELEMETRY_FLUSH_SIZE
+    if should_flush:
+        await flush_telemetry_buffer()
+
     # Check if re-optimization needed (e.g., high waves)
     if data.wave_height > 4.5:
         # Trigger re-optimization
@@ -209,64 +235,45 @@ async def websocket_route_updates(websocket: WebSocket, route_id: str):
             del active_websockets[route_id]
 
 @app.post("/api/audit/log")
-async def log_audit_entry(entry: AuditEntry):
+async def log_audit_entry(entry: AuditEntry, db: Session = Depends(get_db)):
     """
     Add entry to blockchain-style audit log
     """
-    db = next(get_db())
-    
-    # Get previous hash
-    last_entry = db.query(AuditLog).order_by(AuditLog.id.desc()).first()
-    prev_hash = last_entry.hash if last_entry else "0" * 64
-    
-    # Compute new hash
-    entry_data = f"{entry.action}{json.dumps(entry.data)}{entry.timestamp}{prev_hash}"
-    new_hash = hashlib.sha256(entry_data.encode()).hexdigest()
-    
-    # Compute HMAC
-    secret = os.getenv("AUDIT_SECRET", "default-secret-key")
-    signature = hmac.new(secret.encode(), entry_data.encode(), hashlib.sha256).hexdigest()
-    
-    # Store
-    audit_log = AuditLog(
-        action=entry.action,
-        data=json.dumps(entry.data),
-        timestamp=entry.timestamp,
-        hash=new_hash,
-        signature=signature,
-        prev_hash=prev_hash
-    )
-    db.add(audit_log)
-    db.commit()
-    
-    return {"hash": new_hash, "signature": signature}
+    return _append_audit_entry(db, entry)
 
 @app.get("/api/audit/verify")
-async def verify_audit_chain():
+async def verify_audit_chain(db: Session = Depends(get_db)):
     """
     Verify integrity of audit log chain
     """
-    db = next(get_db())
-    entries = db.query(AuditLog).order_by(AuditLog.id).all()
-    
-    if not entries:
-        return {"valid": True, "message": "No entries to verify"}
-    
-    for i, entry in enumerate(entries):
+    # Stream entries instead of materializing the whole chain, carrying
+    # the expected prev_hash in a local
+    prev_hash = "0" * 64
+    count = 0
+    for entry in db.query(AuditLog).order_by(AuditLog.id).yield_per(1000):
         # Verify hash chain
-        if i > 0:
-            if entry.prev_hash != entries[i-1].hash:
-                return {"valid": False, "message": f"Chain broken at entry {entry.id}"}
-        
-        # Verify signature
-        secret = os.getenv("AUDIT_SECRET", "default-secret-key")
-        entry_data = f"{entry.action}{entry.data}{entry.timestamp}{entry.prev_hash}"
-        expected_sig = hmac.new(secret.encode(), entry_data.encode(), hashlib.sha256).hexdigest()
-        
-        if entry.signature != expected_sig:
+        if entry.prev_hash != prev_hash:
+            return {"valid": False, "message": f"Chain broken at entry {entry.id}"}
+
+        # Verify signature (constant-time comparison)
+        entry_bytes = b"".join([
+            entry.action.encode(),
+            entry.data.encode(),
+            entry.timestamp.encode(),
+            entry.prev_hash.encode()
+        ])
+        expected_sig = hmac.digest(_AUDIT_SECRET, entry_bytes, 'sha256').hex()
+
+        if not hmac.compare_digest(entry.signature, expected_sig):
             return {"valid": False, "message": f"Invalid signature at entry {entry.id}"}
-    
-    return {"valid": True, "message": f"All {len(entries)} entries verified"}
+
+        prev_hash = entry.hash
+        count += 1
+
+    if count == 0:
+        return {"valid": True, "message": "No entries to verify"}
+
+    return {"valid": True, "message": f"All {count} entries verified"}
 
 @app.post("/api/quantum/simulate")
 async def quantum_simulate(request: Dict):
@@ -284,29 +291,79 @@ async def quantum_simulate(request: Dict):
 
 # Helper Functions
 
+def _run_optimize(payload: Dict) -> Dict:
+    """Run one route optimization in a worker process
+
+    Module-level so it pickles; each worker reuses its own copy of the
+    stateless module optimizer.
+    """
+    return hacopso_optimizer.optimize(
+        start=(payload['start_lat'], payload['start_lon']),
+        destination=(payload['dest_lat'], payload['dest_lon']),
+        priorities=payload['priorities'],
+        quantum_enhanced=payload['quantum_mode']
+    )
+
+def _route_cache_key(request: RouteRequest) -> tuple:
+    """Hashable key for route requests, with coordinates quantized to
+    ~100 m so near-identical inputs hit the same entry"""
+    return (
+        round(request.start_lat, 3), round(request.start_lon, 3),
+        round(request.dest_lat, 3), round(request.dest_lon, 3),
+        tuple(sorted(request.priorities.items())),
+        request.quantum_mode
+    )
+
+def _bulk_insert_telemetry(rows: List[Dict]):
+    """Insert buffered telemetry rows in a single transaction"""
+    db = SessionLocal()
+    try:
+        db.bulk_insert_mappings(Telemetry, rows)
+        db.commit()
+    finally:
+        db.close()
+
+async def flush_telemetry_buffer():
+    """Drain the telemetry buffer and bulk-insert it off the event loop"""
+    async with telemetry_buffer_lock:
+        rows = list(telemetry_buffer)
+        telemetry_buffer.clear()
+    if rows:
+        await asyncio.to_thread(_bulk_insert_telemetry, rows)
+
+async def _telemetry_flush_loop():
+    """Periodic flush so small bursts still land within a bounded delay"""
+    while True:
+        await asyncio.sleep(TELEMETRY_FLUSH_INTERVAL)
+        await flush_telemetry_buffer()
+
 async def trigger_reoptimization(route_id: str, telemetry: TelemetryData):
     """
     Trigger route re-optimization based on telemetry
     """
-    db = next(get_db())
-    route = db.query(Route).filter(Route.route_id == route_id).first()
-    
-    if not route:
-        return
-    
-    # Re-run optimization with updated environmental data
-    result = hacopso_optimizer.reoptimize(
-        current_path=json.loads(route.path),
-        telemetry_data=telemetry.dict()
-    )
-    
-    # Update route
-    route.path = json.dumps(result['path'])
-    route.distance = result['distance']
-    route.eta = result['eta']
-    route.fuel_estimate = result['fuel']
-    db.commit()
-    
+    # Not an endpoint, so the session is managed here rather than injected
+    db = SessionLocal()
+    try:
+        route = db.query(Route).filter(Route.route_id == route_id).first()
+
+        if not route:
+            return
+
+        # Re-run optimization with updated environmental data
+        result = hacopso_optimizer.reoptimize(
+            current_path=orjson.loads(route.path),
+            telemetry_data=telemetry.dict()
+        )
+
+        # Update route
+        route.path = orjson.dumps(result['path']).decode()
+        route.distance = result['distance']
+        route.eta = result['eta']
+        route.fuel_estimate = result['fuel']
+        db.commit()
+    finally:
+        db.close()
+
     # Broadcast update
     if route_id in active_websockets:
         for ws in active_websockets[route_id]:
@@ -315,6 +372,33 @@ async def trigger_reoptimization(route_id: str, telemetry: TelemetryData):
                 "data": result
             })
 
+def _append_audit_entry(db: Session, entry: AuditEntry) -> Dict:
+    """Hash, sign and store one audit entry on the given session"""
+    # Get previous hash
+    last_entry = db.query(AuditLog).order_by(AuditLog.id.desc()).first()
+    prev_hash = last_entry.hash if last_entry else "0" * 64
+
+    # Compute new hash and HMAC over the same encoded payload
+    entry_bytes = (
+        f"{entry.action}{orjson.dumps(entry.data).decode()}{entry.timestamp}{prev_hash}"
+    ).encode()
+    new_hash = hashlib.sha256(entry_bytes).hexdigest()
+    signature = hmac.digest(_AUDIT_SECRET, entry_bytes, 'sha256').hex()
+
+    # Store
+    audit_log = AuditLog(
+        action=entry.action,
+        data=orjson.dumps(entry.data).decode(),
+        timestamp=entry.timestamp,
+        hash=new_hash,
+        signature=signature,
+        prev_hash=prev_hash
+    )
+    db.add(audit_log)
+    db.commit()
+
+    return {"hash": new_hash, "signature": signature}
+
 async def log_audit(action: str, data: Dict):
     """
     Background task to log audit entries
@@ -324,7 +408,11 @@ async def log_audit(action: str, data: Dict):
         data=data,
         timestamp=datetime.utcnow().isoformat()
     )
-    await log_audit_entry(entry)
+    db = SessionLocal()
+    try:
+        _append_audit_entry(db, entry)
+    finally:
+        db.close()
 
 # Startup event
 @app.on_event("startup")
@@ -335,8 +423,27 @@ async def startup_event():
     print("🚢 BluePath Backend Starting...")
     print("📊 Loading environmental datasets...")
     print("🔄 Initializing HACOPSO optimizer...")
+    app.state.pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    # Keep the task reference so it isn't garbage-collected mid-run
+    app.state.flush_task = asyncio.create_task(_telemetry_flush_loop())
     print("✅ Backend ready!")
 
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Drain buffered telemetry and release the optimization worker pool
+    """
+    app.state.flush_task.cancel()
+    try:
+        await app.state.flush_task
+    except asyncio.CancelledError:
+        pass
+    # Rows below the flush threshold were already acknowledged; write
+    # them out before the process exits
+    await flush_telemetry_buffer()
+    app.state.pool.shutdown()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -7,8 +7,7 @@ Simulates a complete maritime voyage with telemetry
 import asyncio
 import argparse
 from telemetry_simulator import TelemetrySimulator
-import requests
-import json
+import httpx
 
 async def simulate_voyage(
     route_id: str,
@@ -23,32 +22,36 @@ async def simulate_voyage(
     print(f"🌊 Generating environmental data...\n")
     
     simulator = TelemetrySimulator(seed=42)
-    
-    for minute in range(duration_minutes):
-        sample = simulator.generate_sample()
-        sample['route_id'] = route_id
-        
-        # Send to API
-        try:
-            response = requests.post(
-                f"{api_url}/api/iot/push",
-                json=sample,
-                timeout=5
-            )
-            
-            status = "✅" if response.status_code == 200 else "❌"
-            print(f"{status} [{minute:3d}min] Wave: {sample['wave_height']}m | "
-                  f"Wind: {sample['wind_speed']}kt | "
-                  f"Visibility: {sample['visibility']}nm")
-            
-            # Alert on high waves
-            if sample['wave_height'] > 4.5:
-                print(f"  ⚠️  HIGH WAVE ALERT! Re-optimization triggered")
-        
-        except Exception as e:
-            print(f"❌ Error sending telemetry: {e}")
-        
-        await asyncio.sleep(1)  # 1 second = 1 minute in simulation
+
+    # One pooled client for the whole voyage: connections are kept alive
+    # and posts don't block the event loop
+    async with httpx.AsyncClient(
+        base_url=api_url,
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=10)
+    ) as client:
+        for minute in range(duration_minutes):
+            sample = simulator.generate_sample()
+            payload = sample._asdict()
+            payload['route_id'] = route_id
+
+            # Send to API
+            try:
+                response = await client.post("/api/iot/push", json=payload)
+
+                status = "✅" if response.status_code == 200 else "❌"
+                print(f"{status} [{minute:3d}min] Wave: {sample.wave_height:.2f}m | "
+                      f"Wind: {sample.wind_speed:.2f}kt | "
+                      f"Visibility: {sample.visibility:.2f}nm")
+
+                # Alert on high waves
+                if sample.wave_height > 4.5:
+                    print(f"  ⚠️  HIGH WAVE ALERT! Re-optimization triggered")
+
+            except Exception as e:
+                print(f"❌ Error sending telemetry: {e}")
+
+            await asyncio.sleep(1)  # 1 second = 1 minute in simulation
     
     print(f"\n✅ Voyage simulation completed!")
 
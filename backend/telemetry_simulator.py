@@ -3,72 +3,235 @@ IoT Telemetry Simulator
 Generates realistic maritime environmental data
 """
 
-import random
+import math
 import time
+import warnings
 from datetime import datetime
-from typing import Dict
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+from numba import njit
+
+@njit(cache=True)
+def _fill_voyage(mus, sigmas, floors, z, out):
+    """Fused scale/clamp/round loop over pre-drawn normals
+
+    Inputs are float32; out is float64 so the two-decimal rounding
+    survives serialization (rounding in float32 leaves values like
+    2.9100000858306885 after the upcast to Python float).
+    """
+    n, m = out.shape
+    for i in range(n):
+        for j in range(m):
+            v = mus[i, j] + sigmas[j] * z[i, j]
+            if v < floors[j]:
+                v = floors[j]
+            out[i, j] = math.floor(v * 100.0 + 0.5) / 100.0
+
+class Conditions(NamedTuple):
+    """Base sea-state means for the five telemetry channels"""
+    wave: float = 2.5
+    wind: float = 20.0
+    current: float = 1.0
+    visibility: float = 10.0
+    temperature: float = 25.0
+
+NORMAL_CONDITIONS = Conditions()
+STORM_CONDITIONS = Conditions(wave=6.0, wind=45.0, current=2.5, visibility=3.0)
+
+class TelemetrySample(NamedTuple):
+    """One telemetry reading; call ._asdict() where a dict is needed"""
+    timestamp: str
+    wave_height: float
+    wind_speed: float
+    current_speed: float
+    visibility: float
+    temperature: float
+
+@lru_cache(maxsize=8)
+def _voyage_plan(num_samples: int):
+    """Precomputed distribution parameters for a voyage
+
+    Returns (mus, sigmas, floors), all marked read-only since the cache
+    shares them across simulators. Storm conditions cover 30% to 60% of
+    the voyage; encoding the phases as precomputed mean rows means
+    generation never branches on "are we in the storm" per sample.
+    Cached per length so repeated voyages of the same shape reuse the
+    parameter rows instead of retiling them.
+    """
+    storm_start = int(num_samples * 0.3)
+    storm_end = int(num_samples * 0.6)
+    mus = np.tile(
+        np.array(NORMAL_CONDITIONS, dtype=np.float32),
+        (num_samples, 1)
+    )
+    mus[storm_start:storm_end] = STORM_CONDITIONS
+
+    sigmas = np.array([1.0, 5.0, 0.5, 3.0, 2.0], dtype=np.float32)
+    floors = np.array([0.5, 5.0, 0.0, 1.0, -np.inf], dtype=np.float32)
+    for arr in (mus, sigmas, floors):
+        arr.setflags(write=False)
+    return mus, sigmas, floors
 
 class TelemetrySimulator:
     """
     Simulates maritime environmental telemetry data
     """
-    
+
+    # Samples pre-drawn per block for the single-sample path
+    _Z_BLOCK = 64
+
+    # Per-channel spread and lower bound: wave, wind, current,
+    # visibility, temperature
+    _SIGMAS = np.array([1.0, 5.0, 0.5, 3.0, 2.0])
+    _FLOORS = np.array([0.5, 5.0, 0.0, 1.0, -np.inf])
+
     def __init__(self, seed: int = None):
-        if seed:
-            random.seed(seed)
-        
-        self.base_wave = 2.5
-        self.base_wind = 20.0
-        self.base_current = 1.0
-        self.base_visibility = 10.0
-        self.base_temp = 25.0
+        # SFC64 is the fastest bit generator NumPy ships and we only
+        # need statistical quality, not PCG64's stream guarantees.
+        # SFC64(None) seeds from the OS, so seed=0 is honored rather
+        # than falling through a truthiness check
+        self._rng = np.random.Generator(np.random.SFC64(seed))
+
+        # Block cache of normals: generate_sample consumes one row per
+        # call and refills _Z_BLOCK rows at a time
+        self._z_buf = np.empty((0, 5))
+        self._z_pos = 0
+
+        # Per-instance voyage output buffer, reallocated only when the
+        # voyage length changes; instance-local so concurrent
+        # simulators never share scratch memory
+        self._scratch = np.empty((0, 5))
+
+        self.conditions = NORMAL_CONDITIONS
     
-    def generate_sample(self) -> Dict:
-        """Generate a single telemetry sample"""
-        # Add random variations
-        wave_height = max(0.5, self.base_wave + random.gauss(0, 1.0))
-        wind_speed = max(5, self.base_wind + random.gauss(0, 5))
-        current = max(0, self.base_current + random.gauss(0, 0.5))
-        visibility = max(1, self.base_visibility + random.gauss(0, 3))
-        temperature = self.base_temp + random.gauss(0, 2)
-        
-        return {
-            "timestamp": datetime.utcnow().isoformat(),
-            "wave_height": round(wave_height, 2),
-            "wind_speed": round(wind_speed, 2),
-            "current_speed": round(current, 2),
-            "visibility": round(visibility, 2),
-            "temperature": round(temperature, 2)
-        }
+    def generate_sample(self) -> TelemetrySample:
+        """Generate a single telemetry sample
+
+        Values are returned at full precision; rounding is cosmetic and
+        left to display code (the batched voyage path still rounds for
+        its stored records).
+        """
+        # Add random variations: normals come from a block cache so the
+        # Generator call overhead is paid once per _Z_BLOCK samples
+        if self._z_pos >= len(self._z_buf):
+            self._z_buf = self._rng.standard_normal((self._Z_BLOCK, 5))
+            self._z_pos = 0
+        z = self._z_buf[self._z_pos]
+        self._z_pos += 1
+
+        # Scale and clamp all five channels in one fused maximum
+        vals = np.maximum(
+            self._FLOORS, np.array(self.conditions) + self._SIGMAS * z
+        )
+
+        return TelemetrySample(datetime.utcnow().isoformat(), *map(float, vals))
     
     def simulate_storm(self):
         """Simulate storm conditions"""
-        self.base_wave = 6.0
-        self.base_wind = 45.0
-        self.base_current = 2.5
-        self.base_visibility = 3.0
-    
+        self.conditions = STORM_CONDITIONS
+
     def reset_normal(self):
         """Reset to normal conditions"""
-        self.base_wave = 2.5
-        self.base_wind = 20.0
-        self.base_current = 1.0
-        self.base_visibility = 10.0
+        self.conditions = NORMAL_CONDITIONS
     
-    def generate_voyage_data(self, duration_minutes: int = 60, interval_seconds: int = 10):
-        """Generate data for entire voyage simulation"""
-        samples = []
+    def generate_voyage_data(
+        self,
+        duration_minutes: int = 60,
+        interval_seconds: int = 10,
+        realtime: bool = False,
+        return_format: str = "records",
+        device: str = "cpu"
+    ):
+        """Generate data for entire voyage simulation
+
+        All channels are drawn in one batched Gaussian call instead of
+        five scalar random.gauss calls per sample. Columns: wave height,
+        wind speed, current speed, visibility, temperature.
+
+        return_format="records" keeps the list-of-dicts API;
+        "frame" returns a column-contiguous pandas DataFrame instead
+        (requires pandas).
+
+        device="cuda" runs the draw and clamp on the GPU via CuPy and
+        copies the finished batch back, falling back to the CPU path
+        when CuPy is not installed; it uses CuPy's own random stream,
+        so seeded runs are only reproducible on "cpu".
+
+        Offline generation never sleeps; pass realtime=True to restore
+        the scaled-down demo pacing.
+        """
         num_samples = (duration_minutes * 60) // interval_seconds
-        
-        for i in range(num_samples):
-            # Introduce storm at 30% through voyage
-            if i == int(num_samples * 0.3):
-                self.simulate_storm()
-            # Clear storm at 60% through voyage
-            if i == int(num_samples * 0.6):
-                self.reset_normal()
-            
-            samples.append(self.generate_sample())
-            time.sleep(interval_seconds / 1000)  # Scale down for demo
-        
+        mus, sigmas, floors = _voyage_plan(num_samples)
+
+        if device == "cuda":
+            try:
+                import cupy as cp
+            except ImportError:
+                warnings.warn("CuPy not installed; falling back to CPU")
+                device = "cpu"
+
+        if device == "cuda":
+            # Whole pipeline on the GPU; only the finished batch crosses
+            # the bus
+            z = cp.random.standard_normal(
+                (num_samples, 5), dtype=cp.float32
+            )
+            v = cp.asarray(mus) + cp.asarray(sigmas) * z
+            v = cp.maximum(cp.asarray(floors), v).astype(cp.float64)
+            vals = cp.asnumpy(cp.floor(v * 100.0 + 0.5) / 100.0)
+        else:
+            # Normals come from the instance Generator, so successive
+            # voyages continue one stream instead of re-seeding per
+            # call; scaling, clamping and rounding run fused in the
+            # JIT'd loop. Draws and parameters stay float32 for the
+            # bandwidth win; only the rounded output row is float64
+            z = self._rng.standard_normal(
+                (num_samples, 5), dtype=np.float32
+            )
+            if len(self._scratch) != num_samples:
+                self._scratch = np.empty((num_samples, 5), dtype=np.float64)
+            vals = self._scratch
+            _fill_voyage(mus, sigmas, floors, z, vals)
+
+        # Sample instants are a fixed interval apart, so derive them all
+        # from one base timestamp in a single vectorized conversion
+        t0 = np.datetime64(datetime.utcnow(), 'ms')
+        timestamps = (
+            t0 + np.arange(num_samples) * np.timedelta64(interval_seconds, 's')
+        ).astype(str)
+
+        if return_format == "frame":
+            import pandas as pd
+            samples = pd.DataFrame({
+                "timestamp": timestamps,
+                "wave_height": vals[:, 0],
+                "wind_speed": vals[:, 1],
+                "current_speed": vals[:, 2],
+                "visibility": vals[:, 3],
+                "temperature": vals[:, 4]
+            })
+        else:
+            samples = [
+                {
+                    "timestamp": ts,
+                    "wave_height": row[0],
+                    "wind_speed": row[1],
+                    "current_speed": row[2],
+                    "visibility": row[3],
+                    "temperature": row[4]
+                }
+                for ts, row in zip(timestamps.tolist(), vals.tolist())
+            ]
+
+        if realtime:
+            # Scale down for demo, sliced into short sleeps so the loop
+            # stays interruptible; bind the sleep lookup once outside it
+            sleep = time.sleep
+            pause = interval_seconds / 10000
+            for _ in range(num_samples):
+                for _ in range(10):
+                    sleep(pause)
+
         return samples